@@ -16,6 +16,18 @@ TREE_SPACE = "    "       # Empty space for indentation
 # All possible prefixes for parsing
 TREE_PREFIXES = [TREE_BRANCH, TREE_LAST, TREE_VERTICAL, TREE_SPACE]
 
+# Synchronized output (DEC private mode 2026): the terminal holds everything
+# between begin and end and paints it as one frame. Terminals without
+# support ignore the unknown mode.
+SYNC_UPDATE_BEGIN = b"\x1b[?2026h"
+SYNC_UPDATE_END = b"\x1b[?2026l"
+
+# Structure creation runs on a worker thread: it reports progress every
+# CREATE_PROGRESS_INTERVAL entries, and the UI polls for it every
+# BUSY_INPUT_TIMEOUT_MS milliseconds while waiting for keys
+CREATE_PROGRESS_INTERVAL = 50
+BUSY_INPUT_TIMEOUT_MS = 50
+
 # UI Colors (curses color pair indices)
 class Colors:
     HEADER = 1
@@ -82,7 +82,8 @@ def cli_mode(tree_file: str, target_dir: str, dry_run: bool = False):
         return
     
     print("\n🔨 Creating structure...")
-    results = create_file_structure(paths, target_root=target_dir)
+    directories, files = parser.get_creation_plan("")
+    results = create_file_structure(directories, files, target_root=target_dir)
     
     print("\n📊 Results:")
     print(f"  ✓ Created: {len(results['created'])} items")
@@ -2,36 +2,70 @@
 Tree Parser Module - Parses tree text into a structured format
 """
 
+import re
+import sys
+from array import array
 from dataclasses import dataclass, field
-from typing import List, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 from const import TREE_BRANCH, TREE_LAST, TREE_VERTICAL, TREE_SPACE
 
 
-@dataclass
+# Matches a whole line in one go: the run of continuation prefixes (indent),
+# an optional item connector (marker) and whatever follows (rest)
+_LINE_RE = re.compile(
+    "((?:" + re.escape(TREE_VERTICAL) + "|" + re.escape(TREE_SPACE) + ")*)"
+    "(" + re.escape(TREE_BRANCH) + "|" + re.escape(TREE_LAST) + ")?"
+    "(.*)",
+    re.DOTALL,
+)
+_match_line = _LINE_RE.match
+
+# Matches one prefix token at a time for lines whose indentation mixes tree
+# prefixes with stray single spaces or tabs
+_TOKEN_RE = re.compile(
+    "(?P<marker>" + re.escape(TREE_BRANCH) + "|" + re.escape(TREE_LAST) + ")"
+    "|(?P<indent>" + re.escape(TREE_VERTICAL) + "|" + re.escape(TREE_SPACE) + "|\t)"
+    "|(?P<pad> )"
+)
+_match_token = _TOKEN_RE.match
+
+# The leading run of characters that can only form indent or pad tokens.
+# Item markers start outside this set, so the run ends before any marker.
+_INDENT_CHARS_RE = re.compile(
+    "[" + "".join(re.escape(char) for char in sorted(set(TREE_VERTICAL + TREE_SPACE + "\t"))) + "]*"
+)
+_match_indent_chars = _INDENT_CHARS_RE.match
+
+# Every continuation prefix spans the same number of characters
+_INDENT_WIDTH = len(TREE_SPACE)
+
+# Compiled line scanner (parser_c.pyx), used in place of
+# TreeParser._parse_line when it has been built
+try:
+    from parser_c import parse_line as _compiled_parse_line
+except ImportError:
+    _compiled_parse_line = None
+
+# Nodes compare and hash by identity: a generated __eq__ would recurse
+# through children and compare whole subtrees. Slotted nodes drop the
+# per-instance __dict__; dataclass only accepts slots=True from Python 3.10 on
+_NODE_DATACLASS_OPTIONS = {"eq": False, "repr": False}
+if sys.version_info >= (3, 10):
+    _NODE_DATACLASS_OPTIONS["slots"] = True
+
+
+@dataclass(**_NODE_DATACLASS_OPTIONS)
 class TreeNode:
     """Represents a node in the tree structure"""
     name: str
     is_directory: bool
     depth: int
     children: List['TreeNode'] = field(default_factory=list)
-    parent: Optional['TreeNode'] = None
     
     def __repr__(self):
         type_str = "DIR" if self.is_directory else "FILE"
         return f"TreeNode({type_str}: {self.name}, depth={self.depth}, children={len(self.children)})"
-    
-    def get_full_path(self, base_path: str = "") -> str:
-        """Get the full path from root to this node"""
-        parts = []
-        node = self
-        while node is not None:
-            parts.append(node.name)
-            node = node.parent
-        parts.reverse()
-        
-        if base_path:
-            return f"{base_path.rstrip('/')}/{'/'.join(parts)}"
-        return "/".join(parts)
 
 
 class TreeParser:
@@ -45,6 +79,10 @@ class TreeParser:
     def __init__(self):
         self.root: Optional[TreeNode] = None
         self.all_nodes: List[TreeNode] = []
+        # Index into all_nodes of each node's parent (-1 for none), kept flat
+        # so paths can be built without walking TreeNode objects
+        self._parents = array('i')
+        self._dir_count = 0
     
     def parse(self, tree_text: str) -> Optional[TreeNode]:
         """
@@ -56,55 +94,69 @@ class TreeParser:
         Returns:
             The root TreeNode or None if parsing fails
         """
-        lines = tree_text.strip().split('\n')
+        self.all_nodes = nodes = []
+        self._parents = parents = array('i')
+        self.root = None
+        self._dir_count = 0
+        
+        # Blank lines anywhere are skipped below, so only the first line's
+        # indentation needs trimming (lstrip is free when there is none)
+        lines = tree_text.lstrip().splitlines()
         if not lines:
             return None
         
-        self.all_nodes = []
-        self.root = None
+        # Hoist hot attribute lookups out of the per-line loop
+        nodes_append = nodes.append
+        parents_append = parents.append
+        parse_line = self._parse_line
+        max_nodes = self.MAX_NODES
+        max_depth = self.MAX_DEPTH
+        max_segment_length = self.MAX_SEGMENT_LENGTH
         
-        # Stack to keep track of parent nodes at each depth level
-        # Index in stack = depth level
-        parent_stack: List[TreeNode] = []
+        # Stack of parent node indices at each depth level, preallocated
+        # since depth is capped; only the first `top` slots are live
+        parent_stack: List[int] = [0] * (max_depth + 1)
+        top = 0
         
-        for line_num, line in enumerate(lines):
-            if not line.strip():
+        # Last node if it was created as a file; it may still turn out to be
+        # a directory once the depth of the next line is known
+        pending_file: Optional[TreeNode] = None
+        
+        for line in lines:
+            if not line or line.isspace():
                 continue
 
-            if len(self.all_nodes) >= self.MAX_NODES:
-                raise ValueError(f"Total nodes exceed limit of {self.MAX_NODES}")
+            if len(nodes) >= max_nodes:
+                raise ValueError(f"Total nodes exceed limit of {max_nodes}")
 
             # Calculate depth and extract name
-            depth, name = self._parse_line(line)
+            depth, name = parse_line(line)
+
+            # A file followed by a deeper line is a parent without a trailing
+            # slash (common in plain `tree` output), so promote it
+            if pending_file is not None:
+                if depth > pending_file.depth:
+                    pending_file.is_directory = True
+                    self._dir_count += 1
+                pending_file = None
 
-            if depth > self.MAX_DEPTH:
-                raise ValueError(f"Tree depth exceeds limit of {self.MAX_DEPTH}")
+            if depth > max_depth:
+                raise ValueError(f"Tree depth exceeds limit of {max_depth}")
 
             if "\0" in name:
                 raise ValueError("Null bytes are not allowed in path names")
 
-            if len(name) > self.MAX_SEGMENT_LENGTH:
-                raise ValueError(f"Path segment too long (max {self.MAX_SEGMENT_LENGTH})")
+            if len(name) > max_segment_length:
+                raise ValueError(f"Path segment too long (max {max_segment_length})")
 
             if not name:
                 continue
             
             # Check if it's a directory. Primary signal: trailing '/'.
-            # Fallback: if the next non-empty line is deeper, this node is a parent
-            # even without a trailing slash (common in plain `tree` output).
+            # Fallback: promotion above when the next line turns out deeper.
             is_directory = name.endswith('/')
             if is_directory:
                 name = name.rstrip('/')
-            else:
-                # Look ahead to the next meaningful line to infer depth
-                next_depth = None
-                for look_ahead in lines[line_num + 1:]:
-                    if not look_ahead.strip():
-                        continue
-                    next_depth, _ = self._parse_line(look_ahead)
-                    break
-                if next_depth is not None and next_depth > depth:
-                    is_directory = True
             
             # Create the node
             node = TreeNode(
@@ -113,28 +165,35 @@ class TreeParser:
                 depth=depth
             )
             
-            self.all_nodes.append(node)
+            node_index = len(nodes)
+            nodes_append(node)
+            if is_directory:
+                self._dir_count += 1
+            else:
+                pending_file = node
             
-            if line_num == 0 or self.root is None:
+            if self.root is None:
                 # First non-empty line is always the root
                 self.root = node
-                parent_stack = [node]
+                parents_append(-1)
+                parent_stack[0] = node_index
+                top = 1
             else:
-                # Find the correct parent based on depth
-                # Parent is at depth - 1 in the stack
-                while len(parent_stack) > depth:
-                    parent_stack.pop()
-                
-                if parent_stack:
-                    parent = parent_stack[-1]
-                    node.parent = parent
-                    parent.children.append(node)
+                # Find the correct parent based on depth: discard levels at or
+                # below this one, the parent is the deepest remaining node
+                if top > depth:
+                    top = depth
                 
-                # Add this node to the stack at its depth level
-                if len(parent_stack) <= depth:
-                    parent_stack.append(node)
+                if top:
+                    parent_index = parent_stack[top - 1]
+                    nodes[parent_index].children.append(node)
+                    parents_append(parent_index)
                 else:
-                    parent_stack[depth] = node
+                    parents_append(-1)
+                
+                # Add this node to the stack on top of its parent
+                parent_stack[top] = node_index
+                top += 1
         
         return self.root
     
@@ -145,51 +204,37 @@ class TreeParser:
         Returns:
             Tuple of (depth, name)
         """
-        # Count the indentation level by looking for tree characters
-        depth = 0
-        pos = 0
+        indent, marker, rest = _match_line(line).groups()
+        depth = len(indent) // _INDENT_WIDTH
+
+        if marker:
+            return (depth + 1, rest.strip())  # +1 because this item is a child
+
+        if rest[:1].isspace():
+            # Irregular indentation (stray spaces or tabs) - walk the rest manually
+            return self._scan_line(line)
+
+        # No tree prefix found - this is the root or plain text.
+        # rest starts with a non-space character, so only the right side needs trimming
+        return (0, rest.rstrip())
+
+    def _scan_line(self, line: str) -> Tuple[int, str]:
+        """
+        Slow path of _parse_line for prefixes mixing tree characters with
+        single spaces or tabs
         
-        while pos < len(line):
-            remaining = line[pos:]
-            
-            # Check for item markers - these indicate we found the actual item
-            if remaining.startswith(TREE_BRANCH):
-                name = remaining[len(TREE_BRANCH):].strip()
-                return (depth + 1, name)  # +1 because this item is a child
-            
-            if remaining.startswith(TREE_LAST):
-                name = remaining[len(TREE_LAST):].strip()
-                return (depth + 1, name)  # +1 because this item is a child
-            
-            # Check for continuation characters - these add to depth
-            if remaining.startswith(TREE_VERTICAL):
-                depth += 1
-                pos += len(TREE_VERTICAL)
-                continue
-            
-            if remaining.startswith(TREE_SPACE):
-                depth += 1
-                pos += len(TREE_SPACE)
-                continue
-            
-            # Handle single space or tab
-            if remaining[0] == ' ':
-                pos += 1
-                continue
-            
-            if remaining[0] == '\t':
-                depth += 1
-                pos += len(TREE_SPACE) if hasattr(self, 'TREE_SPACE') else 1 # Fallback
-                pos += 1
-                continue
-            
-            # No tree prefix found - this is the root or plain text
-            name = remaining.strip()
-            if name:
-                return (0, name)
-            break
+        Returns:
+            Tuple of (depth, name)
+        """
+        depth, pos = _scan_indent(_match_indent_chars(line).group())
+        
+        # Item markers indicate we found the actual item
+        token = _match_token(line, pos)
+        if token is not None and token.lastgroup == "marker":
+            return (depth + 1, line[token.end():].strip())  # +1 because this item is a child
         
-        return (0, "")
+        # No tree prefix found - this is the root or plain text
+        return (0, line[pos:].strip())
     
     def get_all_paths(self, base_path: str = "") -> List[Tuple[str, bool]]:
         """
@@ -204,33 +249,90 @@ class TreeParser:
         if not self.root:
             return []
         
-        paths: List[Tuple[str, bool]] = []
-        self._collect_paths(self.root, base_path, paths)
+        nodes = self.all_nodes
+        root = nodes[0]
+        
+        # all_nodes is in pre-order, so every parent precedes its children and
+        # a node's path is its parent's already built path plus one segment.
+        # Only the root carries the base prefix; nodes detached from the root
+        # (extra top-level lines) and their subtrees keep None.
+        full_paths: List[Optional[str]] = [None] * len(nodes)
+        full_paths[0] = f"{base_path.rstrip('/')}/{root.name}" if base_path else root.name
+        
+        paths: List[Tuple[str, bool]] = [(full_paths[0], root.is_directory)]
+        append = paths.append
+        for index, node, parent_index in zip(range(len(nodes)), nodes, self._parents):
+            if parent_index < 0:
+                continue
+            parent_path = full_paths[parent_index]
+            if parent_path is not None:
+                full_paths[index] = full_path = f"{parent_path}/{node.name}"
+                append((full_path, node.is_directory))
+        
         return paths
     
-    def _collect_paths(self, node: TreeNode, base_path: str, paths: List[Tuple[str, bool]]):
-        """Recursively collect all paths"""
-        full_path = node.get_full_path(base_path)
-        paths.append((full_path, node.is_directory))
+    def get_creation_plan(self, base_path: str = "") -> Tuple[List[str], List[str]]:
+        """
+        Get the paths to create, split into unique directories and files
         
-        for child in node.children:
-            self._collect_paths(child, base_path, paths)
-    
-    def get_summary(self) -> dict:
-        """Get a summary of the parsed tree"""
-        if not self.all_nodes:
-            return {"total": 0, "directories": 0, "files": 0}
+        Directories keep tree order, so every parent precedes its children
+        and each one needs a single mkdir when created first.
+        
+        Args:
+            base_path: The base directory path
+            
+        Returns:
+            Tuple of (directories, files)
+        """
+        directories: Dict[str, None] = {}
+        files: List[str] = []
         
-        directories = sum(1 for node in self.all_nodes if node.is_directory)
-        files = sum(1 for node in self.all_nodes if not node.is_directory)
+        for path, is_directory in self.get_all_paths(base_path):
+            if is_directory:
+                directories[path] = None
+            else:
+                files.append(path)
         
+        return list(directories), files
+    
+    def get_summary(self) -> dict:
+        """Get a summary of the parsed tree (counts are tallied during parse)"""
         return {
             "total": len(self.all_nodes),
-            "directories": directories,
-            "files": files
+            "directories": self._dir_count,
+            "files": len(self.all_nodes) - self._dir_count
         }
 
 
+@lru_cache(maxsize=256)
+def _scan_indent(prefix: str) -> Tuple[int, int]:
+    """
+    Tokenize an irregular indentation prefix (see _INDENT_CHARS_RE)
+
+    Real inputs repeat a handful of distinct prefixes, so results are cached.
+
+    Returns:
+        Tuple of (depth, number of characters consumed)
+    """
+    depth = 0
+    pos = 0
+    while True:
+        token = _match_token(prefix, pos)
+        if token is None:
+            break
+        
+        # Continuation prefixes and tabs add to depth, single spaces don't
+        if token.lastgroup == "indent":
+            depth += 1
+        pos = token.end()
+    
+    return depth, pos
+
+
+if _compiled_parse_line is not None:
+    TreeParser._parse_line = staticmethod(_compiled_parse_line)
+
+
 def parse_tree(tree_text: str) -> Optional[TreeNode]:
     """
     Convenience function to parse tree text
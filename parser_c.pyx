@@ -0,0 +1,81 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Optional compiled line scanner for the tree parser
+
+Build in place with `cythonize -i parser_c.pyx`; parser.py falls back to
+its pure Python scanner when this module is not available.
+"""
+
+from const import TREE_BRANCH, TREE_LAST, TREE_VERTICAL, TREE_SPACE
+
+cdef str _BRANCH = TREE_BRANCH
+cdef str _LAST = TREE_LAST
+cdef str _VERTICAL = TREE_VERTICAL
+cdef str _SPACE = TREE_SPACE
+
+
+cdef inline bint _starts_with(str line, Py_ssize_t pos, Py_ssize_t length, str prefix):
+    """Check whether prefix occurs in line at pos, comparing code points directly"""
+    cdef Py_ssize_t size = len(prefix)
+    cdef Py_ssize_t k
+    cdef Py_UCS4 expected, actual
+
+    if pos + size > length:
+        return False
+    for k in range(size):
+        expected = prefix[k]
+        actual = line[pos + k]
+        if actual != expected:
+            return False
+    return True
+
+
+cpdef tuple parse_line(str line):
+    """
+    Parse a single line to extract depth and name
+
+    Same rules as TreeParser._parse_line: continuation prefixes and tabs add
+    to depth, single spaces are skipped, an item marker ends the prefix.
+
+    Returns:
+        Tuple of (depth, name)
+    """
+    cdef Py_ssize_t length = len(line)
+    cdef Py_ssize_t pos = 0
+    cdef Py_ssize_t depth = 0
+    cdef Py_UCS4 char
+
+    while pos < length:
+        # Item markers indicate we found the actual item
+        if _starts_with(line, pos, length, _BRANCH):
+            return (depth + 1, line[pos + len(_BRANCH):].strip())  # +1 because this item is a child
+
+        if _starts_with(line, pos, length, _LAST):
+            return (depth + 1, line[pos + len(_LAST):].strip())  # +1 because this item is a child
+
+        # Continuation prefixes add to depth
+        if _starts_with(line, pos, length, _VERTICAL):
+            depth += 1
+            pos += len(_VERTICAL)
+            continue
+
+        if _starts_with(line, pos, length, _SPACE):
+            depth += 1
+            pos += len(_SPACE)
+            continue
+
+        # Single spaces are skipped, tabs add to depth
+        char = line[pos]
+        if char == u' ':
+            pos += 1
+            continue
+
+        if char == u'\t':
+            depth += 1
+            pos += 1
+            continue
+
+        # No tree prefix found - this is the root or plain text
+        return (0, line[pos:].strip())
+
+    return (0, "")
@@ -5,9 +5,16 @@ Uses curses for a beautiful terminal interface
 
 import curses
 import os
+import queue
 import subprocess
+import sys
 import tempfile
-from const import Colors, APP_TITLE, APP_SUBTITLE, MIN_HEIGHT, MIN_WIDTH, WIDE_LAYOUT_MIN_WIDTH
+import threading
+from typing import List, Optional, Tuple
+from const import (
+    Colors, APP_TITLE, APP_SUBTITLE, MIN_HEIGHT, MIN_WIDTH, WIDE_LAYOUT_MIN_WIDTH,
+    SYNC_UPDATE_BEGIN, SYNC_UPDATE_END, BUSY_INPUT_TIMEOUT_MS
+)
 from parser import TreeParser
 from utils import (
     create_file_structure, 
@@ -22,9 +29,20 @@ from ui_layout import (
 from ui_ops import (
     get_clipboard_content,
     validate_editor_command,
-    filter_tree_content
+    filter_tree_lines
 )
 
+# Placeholder written to the editor temp file when there is no tree yet.
+# Temp files are written and read back as UTF-8.
+_TREE_TEMPLATE = (
+    "# Paste or type your tree structure here\n"
+    "# Example:\n"
+    "# project/\n"
+    "# ├── src/\n"
+    "# │   └── main.py\n"
+    "# └── README.md\n"
+).encode("utf-8")
+
 
 class TrTRealUI:
     """Main TUI Application Class"""
@@ -35,6 +53,17 @@ class TrTRealUI:
     # Threshold for side-by-side layout (menu + status panels)
     WIDE_LAYOUT_MIN_WIDTH = WIDE_LAYOUT_MIN_WIDTH
     
+    # Menu entries: (key, label, name of the handler method)
+    _MENU_SPEC = (
+        ("1", "📋 Paste from Clipboard", "_paste_from_clipboard"),
+        ("2", "✏️  Type/Edit Tree", "_edit_tree_external"),
+        ("3", "📁 Set Target Directory", "_set_target"),
+        ("4", "👁️  Preview Structure", "_preview"),
+        ("5", "✨ Create Structure", "_create_structure"),
+        ("6", "🗑️  Clear Input", "_clear_input"),
+        ("q", "🚪 Quit", "_quit"),
+    )
+    
     def __init__(self, stdscr):
         self.stdscr = stdscr
         self.height, self.width = stdscr.getmaxyx()
@@ -42,27 +71,68 @@ class TrTRealUI:
         # Initialize colors
         self._init_colors()
         
+        # Terminal descriptor for synchronized-update markers around each frame.
+        # Markers are only sent to escape-sequence terminals: on Windows curses
+        # draws through the console API, which would print them literally
+        term = os.environ.get("TERM", "")
+        sync_supported = sys.platform != "win32" and term not in ("", "dumb") and sys.stdout.isatty()
+        self._sync_fd = sys.stdout.fileno() if sync_supported else None
+        
         # Application state
         self.tree_text = ""
         self.target_directory = os.path.expanduser("~/")
         self.parser = TreeParser()
         self.parsed_root = None
+        # Counts for parsed_root, taken once per parse
+        self._summary: Optional[dict] = None
+        # Formatted preview lines for parsed_root, built on first draw and
+        # already truncated to the panel width they were built for
+        self._preview_cache: Optional[List[str]] = None
+        self._preview_cache_width = 0
         self.message = ""
         self.message_type = "info"  # info, success, error
+        # Structure creation runs on a worker thread that reports back
+        # through the queue; the thread is None when no creation is running
+        self._creation_thread: Optional[threading.Thread] = None
+        self._creation_queue: queue.Queue = queue.Queue()
+        # Progress line shown under the message while a creation runs, kept
+        # apart from self.message so notices set meanwhile stay visible
+        self._creation_progress: Optional[str] = None
+        # External editor, resolved once from the environment
+        self._editor = os.environ.get("EDITOR") or os.environ.get("VISUAL") or "nano"
         
         # UI state
         self.current_menu_item = 0
-        self.menu_items = [
-            ("1", "📋 Paste from Clipboard", self._paste_from_clipboard),
-            ("2", "✏️  Type/Edit Tree", self._edit_tree_external),
-            ("3", "📁 Set Target Directory", self._set_target),
-            ("4", "👁️  Preview Structure", self._preview),
-            ("5", "✨ Create Structure", self._create_structure),
-            ("6", "🗑️  Clear Input", self._clear_input),
-            ("q", "🚪 Quit", self._quit),
-        ]
+        self.menu_items = [(key, label, getattr(self, attr)) for key, label, attr in self._MENU_SPEC]
+        # Rendered (normal, highlighted) menu rows for the menu width they were built for
+        self._menu_rows: List[Tuple[str, str]] = []
+        self._menu_rows_width = 0
+        # Key code -> handler: menu shortcuts plus navigation
+        self._key_map = {ord(key): action for key, _, action in self.menu_items}
+        self._key_map.update({
+            ord('Q'): self._quit,
+            curses.KEY_UP: self._menu_up,
+            curses.KEY_DOWN: self._menu_down,
+            ord('\n'): self._menu_activate,
+            curses.KEY_ENTER: self._menu_activate,
+            curses.KEY_RESIZE: self._update_size,
+        })
         
         self.running = True
+        # Set whenever state shown on screen may have changed; frames are
+        # only redrawn when it is set
+        self._dirty = True
+    
+    @property
+    def tree_text(self) -> str:
+        """Raw tree input text"""
+        return self._tree_text
+    
+    @tree_text.setter
+    def tree_text(self, value: str):
+        # Line count is shown every frame, so count once per assignment
+        self._tree_text = value
+        self._tree_line_count = value.count('\n') + 1 if value else 0
     
     def _is_wide_layout(self) -> bool:
         """Check if we have enough width for side-by-side panels"""
@@ -93,15 +163,23 @@ class TrTRealUI:
         """Main application loop"""
         curses.curs_set(0)  # Hide cursor
         self.stdscr.keypad(True)
+        # getch() sleeps until a key arrives; only a running creation
+        # switches to a timeout so its progress can be picked up
+        self._update_input_timeout()
         
         while self.running:
-            self.height, self.width = self.stdscr.getmaxyx()
-            self._draw()
+            if self._creation_thread is not None:
+                self._poll_creation()
+            if self._dirty:
+                self._draw()
+                self._dirty = False
             self._handle_input()
     
     def _draw(self):
         """Draw the entire UI"""
-        self.stdscr.clear()
+        # erase() only blanks the virtual screen; unlike clear() it does not
+        # force a full repaint, so doupdate() sends just the changed cells
+        self.stdscr.erase()
         
         try:
             # Handle terminal too small
@@ -113,11 +191,24 @@ class TrTRealUI:
                 self._draw_status_panel()
                 self._draw_preview_panel()
                 self._draw_message()
+                self._draw_progress()
                 self._draw_footer()
         except curses.error:
             pass
         
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
+        self._write_terminal(SYNC_UPDATE_BEGIN)
+        curses.doupdate()
+        self._write_terminal(SYNC_UPDATE_END)
+    
+    def _write_terminal(self, sequence: bytes):
+        """Write a raw control sequence straight to the terminal"""
+        if self._sync_fd is None:
+            return
+        try:
+            os.write(self._sync_fd, sequence)
+        except OSError:
+            self._sync_fd = None
     
     def _draw_resize_message(self):
         """Show message when terminal is too small"""
@@ -176,23 +267,29 @@ class TrTRealUI:
         # Menu box
         draw_box(self.stdscr, start_y, 1, menu_height, menu_width, "Menu", Colors.TITLE)
         
-        for i, (key, label, _) in enumerate(self.menu_items):
+        for i, (text, highlighted_text) in enumerate(self._get_menu_rows(menu_width)):
             y = start_y + 1 + i
             x = 3
             
-            # Truncate label if needed
-            max_label_len = menu_width - 10
-            display_label = label[:max_label_len] if len(label) > max_label_len else label
-            
             if i == self.current_menu_item:
                 # Highlighted item
-                text = f" [{key}] {display_label} "
-                self.stdscr.addstr(y, x, text.ljust(menu_width - 4), 
+                self.stdscr.addstr(y, x, highlighted_text, 
                                    curses.color_pair(Colors.SELECTED) | curses.A_BOLD)
             else:
-                text = f" [{key}] {display_label}"
                 self.stdscr.addstr(y, x, text, curses.color_pair(Colors.MENU))
     
+    def _get_menu_rows(self, menu_width: int) -> List[Tuple[str, str]]:
+        """Get the (normal, highlighted) menu rows, formatted once per menu width"""
+        if self._menu_rows_width != menu_width:
+            # Truncate labels if needed
+            max_label_len = menu_width - 10
+            self._menu_rows = [
+                (f" [{key}] {label[:max_label_len]}", f" [{key}] {label[:max_label_len]} ".ljust(menu_width - 4))
+                for key, label, _ in self.menu_items
+            ]
+            self._menu_rows_width = menu_width
+        return self._menu_rows
+    
     def _get_menu_height(self) -> int:
         """Get the height of the menu panel"""
         return len(self.menu_items) + 2
@@ -236,8 +333,7 @@ class TrTRealUI:
         """Draw the tree input status line."""
         try:
             if self.tree_text:
-                lines = self.tree_text.count('\n') + 1
-                text = f"📝 Tree Input: {lines} lines"
+                text = f"📝 Tree Input: {self._tree_line_count} lines"
                 self.stdscr.addstr(y, start_x + 2, text[:panel_width - 4], curses.color_pair(Colors.SUCCESS))
             else:
                 self.stdscr.addstr(y, start_x + 2, "📝 Tree Input: Empty", curses.color_pair(Colors.ERROR))
@@ -248,7 +344,7 @@ class TrTRealUI:
         """Draw the parsed status line."""
         try:
             if self.parsed_root:
-                summary = self.parser.get_summary()
+                summary = self._summary
                 text = f"📊 Parsed: {summary['directories']} dirs, {summary['files']} files"
                 self.stdscr.addstr(y, start_x + 2, text[:panel_width - 4], curses.color_pair(Colors.SUCCESS))
             else:
@@ -282,33 +378,42 @@ class TrTRealUI:
 
     def _draw_parsed_preview(self, start_y: int, start_x: int, panel_width: int, panel_height: int):
         """Render parsed preview items."""
-        paths = self.parser.get_all_paths("")
+        preview_lines = self._get_preview_lines(panel_width)
         y = start_y + 1
         max_lines = panel_height - 2
 
-        for path, is_dir in paths[:max_lines]:
+        for text in preview_lines[:max_lines]:
             if y >= start_y + panel_height - 1:
                 break
-            self._draw_preview_line(y, start_x, panel_width, path, is_dir)
+            self._draw_preview_line(y, start_x, text)
             y += 1
 
-        if len(paths) > max_lines:
+        if len(preview_lines) > max_lines:
             try:
                 self.stdscr.addstr(
                     y,
                     start_x + 2,
-                    f" ... and {len(paths) - max_lines} more items",
+                    f" ... and {len(preview_lines) - max_lines} more items",
                     curses.color_pair(Colors.INFO),
                 )
             except curses.error:
                 pass
 
-    def _draw_preview_line(self, y: int, start_x: int, panel_width: int, path: str, is_dir: bool):
+    def _get_preview_lines(self, panel_width: int) -> List[str]:
+        """Get the preview lines fitted to panel_width, building them once per parsed tree and width."""
+        if self._preview_cache is None or self._preview_cache_width != panel_width:
+            max_text_len = panel_width - 4
+            truncate_len = panel_width - 7
+            lines = []
+            for path, is_dir in self.parser.get_all_paths(""):
+                text = f" {'📁' if is_dir else '📄'} {path}"
+                lines.append(text if len(text) <= max_text_len else text[:truncate_len] + "...")
+            self._preview_cache = lines
+            self._preview_cache_width = panel_width
+        return self._preview_cache
+
+    def _draw_preview_line(self, y: int, start_x: int, text: str):
         """Draw a single preview line."""
-        icon = "📁" if is_dir else "📄"
-        text = f" {icon} {path}"
-        if len(text) > panel_width - 4:
-            text = text[:panel_width - 7] + "..."
         try:
             self.stdscr.addstr(y, start_x + 2, text, curses.color_pair(Colors.PREVIEW))
         except curses.error:
@@ -345,6 +450,14 @@ class TrTRealUI:
             except curses.error:
                 pass
     
+    def _draw_progress(self):
+        """Draw the creation progress line"""
+        if self._creation_progress:
+            try:
+                self.stdscr.addstr(self.height - 2, 2, self._creation_progress[:self.width - 4], curses.color_pair(Colors.INFO))
+            except curses.error:
+                pass
+    
     def _draw_footer(self):
         """Draw the footer with help"""
         y = self.height - 1
@@ -360,29 +473,38 @@ class TrTRealUI:
     def _handle_input(self):
         """Handle keyboard input"""
         key = self.stdscr.getch()
+        if key == curses.ERR:
+            # Input timeout while a creation runs: no key, nothing to handle
+            return
+        
+        action = self._key_map.get(key)
+        if action is None:
+            # Unbound key: nothing changed, keep the current frame
+            return
         
-        if key == ord('q') or key == ord('Q'):
-            self.running = False
-        elif key == curses.KEY_UP:
-            self.current_menu_item = (self.current_menu_item - 1) % len(self.menu_items)
-        elif key == curses.KEY_DOWN:
-            self.current_menu_item = (self.current_menu_item + 1) % len(self.menu_items)
-        elif key == ord('\n') or key == curses.KEY_ENTER or key == 10:
-            # Execute current menu item
-            _, _, action = self.menu_items[self.current_menu_item]
-            action()
-        elif key == ord('1'):
-            self._paste_from_clipboard()
-        elif key == ord('2'):
-            self._edit_tree_external()
-        elif key == ord('3'):
-            self._set_target()
-        elif key == ord('4'):
-            self._preview()
-        elif key == ord('5'):
-            self._create_structure()
-        elif key == ord('6'):
-            self._clear_input()
+        action()
+        self._dirty = True
+    
+    def _update_size(self):
+        """Re-read the terminal size after a resize.
+        
+        Width-dependent caches (preview lines, menu rows, box borders) are
+        keyed on the width they were built for and rebuild on the next draw.
+        """
+        self.height, self.width = self.stdscr.getmaxyx()
+    
+    def _menu_up(self):
+        """Move the menu selection up"""
+        self.current_menu_item = (self.current_menu_item - 1) % len(self.menu_items)
+    
+    def _menu_down(self):
+        """Move the menu selection down"""
+        self.current_menu_item = (self.current_menu_item + 1) % len(self.menu_items)
+    
+    def _menu_activate(self):
+        """Execute the selected menu item"""
+        _, _, action = self.menu_items[self.current_menu_item]
+        action()
     
     def _paste_from_clipboard(self):
         """Paste tree structure directly from system clipboard"""
@@ -401,9 +523,8 @@ class TrTRealUI:
         self._parse_tree()
         
         if self.parsed_root:
-            summary = self.parser.get_summary()
-            lines = self.tree_text.count('\n') + 1
-            self.message = f"✓ Pasted {lines} lines: {summary['directories']} dirs, {summary['files']} files"
+            summary = self._summary
+            self.message = f"✓ Pasted {self._tree_line_count} lines: {summary['directories']} dirs, {summary['files']} files"
             self.message_type = "success"
         else:
             self.message = "✗ Pasted content but failed to parse as tree"
@@ -412,10 +533,9 @@ class TrTRealUI:
     def _edit_tree_external(self):
         """Open external editor to edit tree structure"""
         temp_path = self._create_temp_tree_file()
-        editor_cmd = self._get_editor_command()
 
         try:
-            cmd_parts = validate_editor_command(editor_cmd)
+            cmd_parts = validate_editor_command(self._editor)
         except ValueError as e:
             self.message = f"✗ {e}"
             self.message_type = "error"
@@ -425,8 +545,8 @@ class TrTRealUI:
         curses.endwin()
         try:
             subprocess.run(cmd_parts + [temp_path])
-            content = self._read_temp_tree_file(temp_path)
-            self._apply_tree_content(content)
+            tree_text = self._read_temp_tree_file(temp_path)
+            self._apply_tree_content(tree_text)
 
         except Exception as e:
             self.message = f"✗ Editor error: {e}"
@@ -437,34 +557,31 @@ class TrTRealUI:
 
     def _create_temp_tree_file(self) -> str:
         """Create a temporary tree file for editing."""
-        template = (
-            self.tree_text
-            if self.tree_text
-            else "# Paste or type your tree structure here\n# Example:\n# project/\n# ├── src/\n# │   └── main.py\n# └── README.md\n"
-        )
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as temp_file:
-            temp_file.write(template)
-            return temp_file.name
-
-    def _get_editor_command(self) -> str:
-        """Get editor from environment variables."""
-        return os.environ.get("EDITOR", os.environ.get("VISUAL", "nano"))
+        content = self.tree_text.encode("utf-8") if self.tree_text else _TREE_TEMPLATE
+        # mkstemp hands back an open descriptor (created with O_EXCL, mode 0600)
+        fd, temp_path = tempfile.mkstemp(suffix=".txt")
+        try:
+            os.write(fd, content)
+        finally:
+            os.close(fd)
+        return temp_path
 
     def _read_temp_tree_file(self, temp_path: str) -> str:
-        """Read edited content from the temp file."""
-        with open(temp_path, "r") as temp_file:
-            return temp_file.read()
+        """Read edited tree text from the temp file, dropping comment lines."""
+        with open(temp_path, "r", encoding="utf-8") as temp_file:
+            # Filter line by line as the file is read
+            return filter_tree_lines(temp_file)
 
-    def _apply_tree_content(self, content: str):
+    def _apply_tree_content(self, tree_text: str):
         """Apply edited tree content to the UI state."""
-        self.tree_text = filter_tree_content(content)
+        self.tree_text = tree_text
 
         if not self.tree_text:
             return
 
         self._parse_tree()
         if self.parsed_root:
-            summary = self.parser.get_summary()
+            summary = self._summary
             self.message = f"✓ Loaded: {summary['directories']} dirs, {summary['files']} files"
             self.message_type = "success"
         else:
@@ -487,12 +604,17 @@ class TrTRealUI:
         curses.noecho()
         curses.cbreak()
         self.stdscr.keypad(True)
+        self._update_input_timeout()
         curses.curs_set(0)
+        # The terminal may have been resized while the editor had it
+        self._update_size()
     
     def _set_target(self):
         """Set target directory"""
         curses.curs_set(1)
         curses.echo()
+        # The prompt needs blocking reads even while a creation is running
+        self.stdscr.timeout(-1)
         
         # Draw input prompt
         y = self.height // 2
@@ -525,6 +647,9 @@ class TrTRealUI:
         
         curses.noecho()
         curses.curs_set(0)
+        self._update_input_timeout()
+        # A resize during the prompt is consumed by getstr
+        self._update_size()
     
     def _preview(self):
         """Parse and preview the tree structure"""
@@ -536,7 +661,7 @@ class TrTRealUI:
         self._parse_tree()
         
         if self.parsed_root:
-            summary = self.parser.get_summary()
+            summary = self._summary
             self.message = f"✓ Preview ready: {summary['directories']} directories, {summary['files']} files"
             self.message_type = "success"
         else:
@@ -545,10 +670,21 @@ class TrTRealUI:
     
     def _parse_tree(self):
         """Parse the tree text"""
+        self._preview_cache = None
+        # Drop the previous tree first: if parse raises, the parser holds a
+        # partial tree that must not pair with the old root and summary
+        self.parsed_root = None
+        self._summary = None
         self.parsed_root = self.parser.parse(self.tree_text)
+        self._summary = self.parser.get_summary() if self.parsed_root else None
     
     def _create_structure(self):
         """Create the file structure"""
+        if self._creation_thread is not None:
+            self.message = "⏳ Creation already in progress"
+            self.message_type = "info"
+            return
+        
         if not self.parsed_root:
             self.message = "✗ No tree parsed. Press [4] to preview first."
             self.message_type = "error"
@@ -558,7 +694,7 @@ class TrTRealUI:
         curses.curs_set(0)
         y = self.height // 2
         
-        summary = self.parser.get_summary()
+        summary = self._summary
         confirm_msg = f"Create {summary['directories']} dirs and {summary['files']} files in {self.target_directory}? [y/n]"
         
         try:
@@ -569,35 +705,103 @@ class TrTRealUI:
             pass
         
         key = self.stdscr.getch()
+        # A resize answers the prompt as "no"; pick up the new size
+        self._update_size()
         
         if key == ord('y') or key == ord('Y'):
-            # Get paths and create structure
-            paths = self.parser.get_all_paths("")
-            results = create_file_structure(paths, target_root=self.target_directory)
-            
-            created = len(results["created"])
-            skipped = len(results["skipped"])
-            errors = len(results["errors"])
+            # Get paths and create structure in the background, so the UI
+            # keeps drawing while the filesystem works
+            directories, files = self.parser.get_creation_plan("")
+            self._creation_thread = threading.Thread(
+                target=self._run_creation,
+                args=(directories, files, self.target_directory),
+                daemon=True,
+            )
+            self._creation_thread.start()
+            self._update_input_timeout()
             
-            if errors == 0:
-                self.message = f"✓ Created {created} items, skipped {skipped} existing"
-                self.message_type = "success"
-            else:
-                self.message = f"⚠ Created {created}, skipped {skipped}, errors: {errors}"
-                self.message_type = "error"
+            total = len(directories) + len(files)
+            self._creation_progress = f"Progress: 0/{total} items"
+            self.message = f"⏳ Creating {total} items..."
+            self.message_type = "info"
         else:
             self.message = "Operation cancelled"
             self.message_type = "info"
     
+    def _run_creation(self, directories: List[str], files: List[str], target_root: str):
+        """Worker thread: create the structure and post progress and results to the queue"""
+        def report(done: int, total: int):
+            self._creation_queue.put(("progress", (done, total)))
+        
+        try:
+            results = create_file_structure(directories, files, target_root=target_root, progress=report)
+        except Exception as e:
+            self._creation_queue.put(("error", e))
+        else:
+            self._creation_queue.put(("done", results))
+    
+    def _poll_creation(self):
+        """Apply updates posted by the creation worker"""
+        while True:
+            try:
+                kind, payload = self._creation_queue.get_nowait()
+            except queue.Empty:
+                return
+            
+            if kind == "progress":
+                done, total = payload
+                progress = f"Progress: {done}/{total} items"
+                # Redraw only when the shown progress actually changes
+                if progress != self._creation_progress:
+                    self._creation_progress = progress
+                    self._dirty = True
+            else:
+                self._finish_creation(kind, payload)
+                self._dirty = True
+    
+    def _finish_creation(self, kind: str, payload):
+        """Report the outcome of a finished creation and return to idle input"""
+        self._creation_thread.join()
+        self._creation_thread = None
+        self._creation_progress = None
+        self._update_input_timeout()
+        
+        if kind == "error":
+            self.message = f"✗ Creation failed: {payload}"
+            self.message_type = "error"
+            return
+        
+        created = len(payload["created"])
+        skipped = len(payload["skipped"])
+        errors = len(payload["errors"])
+        
+        if errors == 0:
+            self.message = f"✓ Created {created} items, skipped {skipped} existing"
+            self.message_type = "success"
+        else:
+            self.message = f"⚠ Created {created}, skipped {skipped}, errors: {errors}"
+            self.message_type = "error"
+    
+    def _update_input_timeout(self):
+        """Block on input when idle; wake up regularly while a creation runs"""
+        self.stdscr.timeout(BUSY_INPUT_TIMEOUT_MS if self._creation_thread is not None else -1)
+    
     def _clear_input(self):
         """Clear the tree input"""
         self.tree_text = ""
         self.parsed_root = None
+        self._summary = None
+        self._preview_cache = None
         self.message = "✓ Input cleared"
         self.message_type = "success"
     
     def _quit(self):
         """Quit the application"""
+        if self._creation_thread is not None:
+            # Leaving now would stop the worker halfway through the tree
+            self.message = "⏳ Wait for the structure creation to finish before quitting"
+            self.message_type = "info"
+            return
         self.running = False
 
 
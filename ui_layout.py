@@ -1,5 +1,6 @@
 
 import curses
+from functools import lru_cache
 from const import Colors
 
 def calculate_status_panel_layout(
@@ -49,11 +50,19 @@ def calculate_preview_panel_layout(
 
     return start_y, panel_width, panel_height
 
+@lru_cache(maxsize=32)
+def _border_lines(width: int):
+    """Top and bottom border strings for a box of the given width."""
+    horizontal = "─" * (width - 2)
+    return "╭" + horizontal + "╮", "╰" + horizontal + "╯"
+
+
 def draw_box(stdscr, y: int, x: int, height: int, width: int, title: str, title_color: int):
     """Draw a box with a title"""
+    top, bottom = _border_lines(width)
     try:
         # Top border with title
-        stdscr.addstr(y, x, "╭" + "─" * (width - 2) + "╮", curses.color_pair(Colors.BORDER))
+        stdscr.addstr(y, x, top, curses.color_pair(Colors.BORDER))
         if title:
             title_x = x + 2
             stdscr.addstr(y, title_x, f" {title} ", curses.color_pair(title_color) | curses.A_BOLD)
@@ -64,6 +73,6 @@ def draw_box(stdscr, y: int, x: int, height: int, width: int, title: str, title_
             stdscr.addstr(y + i, x + width - 1, "│", curses.color_pair(Colors.BORDER))
         
         # Bottom border
-        stdscr.addstr(y + height - 1, x, "╰" + "─" * (width - 2) + "╯", curses.color_pair(Colors.BORDER))
+        stdscr.addstr(y + height - 1, x, bottom, curses.color_pair(Colors.BORDER))
     except curses.error:
         pass
@@ -1,10 +1,18 @@
+import locale
 import os
 import shutil
 import shlex
 import subprocess
 import sys
 import tempfile
-from typing import Callable, List, Optional, Tuple
+from typing import Callable, Iterable, List, Optional, Tuple
+
+# On macOS, read the pasteboard in-process through PyObjC when it is
+# installed instead of spawning pbpaste for every paste
+try:
+    import AppKit
+except ImportError:
+    AppKit = None
 
 def select_clipboard_command(
     platform: str,
@@ -35,22 +43,47 @@ def get_clipboard_unavailable_message(platform: str) -> str:
     return "Clipboard utility not found. Install xclip or xsel."
 
 
+def get_native_clipboard_content() -> Optional[str]:
+    """Read the macOS pasteboard in-process, or None if PyObjC is unavailable."""
+    if AppKit is None or not sys.platform.startswith("darwin"):
+        return None
+
+    content = AppKit.NSPasteboard.generalPasteboard().stringForType_(AppKit.NSPasteboardTypeString)
+    return str(content) if content else ""
+
+
 def get_clipboard_content() -> Tuple[str, Optional[str]]:
     """Get content from system clipboard across platforms."""
+    try:
+        native_content = get_native_clipboard_content()
+    except Exception as exc:
+        return "", f"Clipboard error: {exc}"
+    if native_content is not None:
+        return native_content, None
+
     command = select_clipboard_command(sys.platform, shutil.which)
     if not command:
         return "", get_clipboard_unavailable_message(sys.platform)
 
     try:
-        result = subprocess.run(command, capture_output=True, text=True, timeout=2)
+        result = subprocess.run(
+            command,
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            timeout=2,
+        )
     except Exception as exc:
         return "", f"Clipboard error: {exc}"
 
+    # Decode with the locale encoding, replacing undecodable bytes. Line
+    # endings are passed through unchanged (\r\n from pwsh/powershell
+    # included); the parser's splitlines() handles them
+    encoding = locale.getpreferredencoding(False)
     if result.returncode != 0:
-        error_message = result.stderr.strip() or "Clipboard command failed"
+        error_message = result.stderr.decode(encoding, "replace").strip() or "Clipboard command failed"
         return "", error_message
 
-    return result.stdout, None
+    return result.stdout.decode(encoding, "replace"), None
 
 
 def validate_editor_command(editor_cmd: str) -> List[str]:
@@ -77,8 +110,10 @@ def validate_editor_command(editor_cmd: str) -> List[str]:
     return parts
 
 
-def filter_tree_content(content: str) -> str:
-    """Filter editor content, removing comment lines."""
-    lines = content.splitlines()
-    filtered_lines = [line for line in lines if not line.strip().startswith("#")]
-    return "\n".join(filtered_lines).strip()
+def filter_tree_lines(lines: Iterable[str]) -> str:
+    """Filter editor lines, removing comment lines.
+
+    Takes lines with their line endings, e.g. an open text file.
+    """
+    # Only the leading side matters for spotting a comment
+    return "".join(line for line in lines if not line.lstrip().startswith("#")).strip()
@@ -3,38 +3,49 @@ Utility functions for TrTReal
 """
 
 import os
-from typing import List, Tuple
+import stat
+from itertools import chain, repeat
+from typing import Callable, List, Optional, Set, Tuple
 from pathlib import Path
+from const import CREATE_PROGRESS_INTERVAL
 
 
-def safe_resolve_path(root_path: Path, path_obj: Path) -> Path:
-    """Resolve a path safely within a root directory."""
-    root_path = root_path.resolve()
-    if path_obj.is_absolute():
+def _resolve_within_root(root: str, path: str) -> str:
+    """
+    Resolve path against root, refusing absolute paths and paths that
+    escape root (through '..' or symlinks)
+    
+    root must already be resolved; works on plain strings so the creation
+    loop builds no Path objects per entry.
+    """
+    if os.path.isabs(path):
         raise ValueError("Absolute paths are not allowed")
 
-    normalized_path = (root_path / path_obj).resolve()
+    normalized_path = os.path.realpath(os.path.join(root, path))
 
-    try:
-        normalized_path.relative_to(root_path)
-    except ValueError as exc:
-        raise ValueError("Path escapes target directory") from exc
+    if normalized_path != root and not normalized_path.startswith(root.rstrip(os.sep) + os.sep):
+        raise ValueError("Path escapes target directory")
 
     return normalized_path
 
 
 def create_file_structure(
-    paths: List[Tuple[str, bool]],
+    directories: List[str],
+    files: List[str],
     dry_run: bool = False,
     target_root: str = ".",
+    progress: Optional[Callable[[int, int], None]] = None,
 ) -> dict:
     """
-    Create files and directories from the parsed paths
+    Create files and directories from a parsed creation plan
     
     Args:
-        paths: List of tuples (relative_path, is_directory)
+        directories: Unique relative directory paths, parents before children
+        files: Relative file paths
         dry_run: If True, don't actually create anything, just validate
         target_root: Root directory where all paths must be created
+        progress: Optional callback taking (done, total), called every
+            CREATE_PROGRESS_INTERVAL entries
         
     Returns:
         Dictionary with results: created, skipped, errors
@@ -45,40 +56,75 @@ def create_file_structure(
         "errors": []
     }
     
-    root_path = Path(target_root).expanduser().resolve()
+    root = os.path.realpath(os.path.expanduser(target_root))
+    # Directories known to exist, so each file's parent is made at most once
+    known_dirs: Set[str] = set()
     
-    for path, is_directory in paths:
-        try:
-            path_obj = Path(path)
-            normalized_path = safe_resolve_path(root_path, path_obj)
-            
-            if normalized_path.exists():
-                results["skipped"].append((str(normalized_path), "Already exists"))
-                continue
-            
-            if not dry_run:
-                if is_directory:
-                    normalized_path.mkdir(parents=True, exist_ok=True)
-                else:
-                    # Ensure parent directory exists
-                    normalized_path.parent.mkdir(parents=True, exist_ok=True)
-                    # Create empty file
-                    normalized_path.touch()
-            
-            results["created"].append(str(normalized_path))
-            
-        except ValueError as e:
-            results["errors"].append((path, str(e)))
-        except PermissionError:
-            results["errors"].append((path, "Permission denied"))
-        except OSError as e:
-            results["errors"].append((path, str(e)))
-        except Exception as e:
-            results["errors"].append((path, f"Unexpected error: {e}"))
+    # Directories first so that files land in already existing parents
+    total = len(directories) + len(files)
+    plan = chain(zip(directories, repeat(True)), zip(files, repeat(False)))
+    for done, (path, is_directory) in enumerate(plan, 1):
+        _create_path(root, path, is_directory, dry_run, results, known_dirs)
+        if progress is not None and done % CREATE_PROGRESS_INTERVAL == 0:
+            progress(done, total)
     
     return results
 
 
+def _create_path(
+    root: str,
+    path: str,
+    is_directory: bool,
+    dry_run: bool,
+    results: dict,
+    known_dirs: Set[str],
+):
+    """Create a single directory or empty file, recording the outcome in results"""
+    try:
+        normalized_path = _resolve_within_root(root, path)
+        
+        if dry_run:
+            if os.path.exists(normalized_path):
+                results["skipped"].append((normalized_path, "Already exists"))
+            else:
+                results["created"].append(normalized_path)
+            return
+        
+        # Creation itself reports existing entries (FileExistsError), which
+        # saves a separate exists() check per path
+        try:
+            if is_directory:
+                os.makedirs(normalized_path)
+            else:
+                # Ensure parent directory exists
+                parent = os.path.dirname(normalized_path)
+                if parent not in known_dirs:
+                    os.makedirs(parent, exist_ok=True)
+                    known_dirs.add(parent)
+                # Create empty file
+                os.close(os.open(normalized_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666))
+        except FileExistsError:
+            if not os.path.lexists(normalized_path):
+                raise
+            if is_directory and os.path.isdir(normalized_path):
+                known_dirs.add(normalized_path)
+            results["skipped"].append((normalized_path, "Already exists"))
+            return
+        
+        if is_directory:
+            known_dirs.add(normalized_path)
+        results["created"].append(normalized_path)
+        
+    except ValueError as e:
+        results["errors"].append((path, str(e)))
+    except PermissionError:
+        results["errors"].append((path, "Permission denied"))
+    except OSError as e:
+        results["errors"].append((path, str(e)))
+    except Exception as e:
+        results["errors"].append((path, f"Unexpected error: {e}"))
+
+
 def validate_target_directory(path: str) -> Tuple[bool, str]:
     """
     Validate that the target directory is valid and writable
@@ -94,10 +140,14 @@ def validate_target_directory(path: str) -> Tuple[bool, str]:
     
     path_obj = Path(path).expanduser().resolve()
     
-    # Check if parent exists or can be created
-    if not path_obj.exists():
+    # One stat answers both "does it exist" and "is it a directory"
+    try:
+        mode = os.stat(path_obj).st_mode
+    except (FileNotFoundError, NotADirectoryError):
         # Check if parent directory exists
-        if not path_obj.parent.exists():
+        try:
+            os.stat(path_obj.parent)
+        except (FileNotFoundError, NotADirectoryError):
             return False, f"Parent directory does not exist: {path_obj.parent}"
         
         # Check if we can write to parent
@@ -107,7 +157,7 @@ def validate_target_directory(path: str) -> Tuple[bool, str]:
         return True, f"Directory will be created: {path_obj}"
     
     # Directory exists
-    if not path_obj.is_dir():
+    if not stat.S_ISDIR(mode):
         return False, f"Path exists but is not a directory: {path_obj}"
     
     if not os.access(path_obj, os.W_OK):
@@ -181,20 +231,25 @@ def count_items_in_directory(path: str) -> Tuple[int, int]:
     Returns:
         Tuple of (file_count, directory_count)
     """
-    path_obj = Path(path)
-    if not path_obj.exists():
-        return 0, 0
-    
     files = 0
     directories = 0
     
-    try:
-        for item in path_obj.rglob("*"):
-            if item.is_file():
-                files += 1
-            elif item.is_dir():
-                directories += 1
-    except PermissionError:
-        pass
+    # Walk with os.scandir: DirEntry type checks come from the directory
+    # listing itself, so only symlinks need an extra stat
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        directories += 1
+                        # Count symlinked directories but don't descend into them
+                        if not entry.is_symlink():
+                            stack.append(entry.path)
+                    elif entry.is_file():
+                        files += 1
+        except OSError:
+            # Missing or unreadable directory
+            continue
     
     return files, directories